@@ -1,10 +1,19 @@
 """Agents package."""
 
 from .transcript_agent import extract_transcript
-from .analysis_agent import analyze_market
-from .recommendation_agent import generate_recommendation
+from .analysis_agent import analyze_market, stream_market_analysis
+from .recommendation_agent import generate_recommendation, stream_recommendation
+from .combined_agent import analyze_and_recommend
 from .aggregated_agent import generate_aggregated_recommendation
 
-__all__ = ['extract_transcript', 'analyze_market', 'generate_recommendation', 'generate_aggregated_recommendation']
+__all__ = [
+    'extract_transcript',
+    'analyze_market',
+    'stream_market_analysis',
+    'generate_recommendation',
+    'stream_recommendation',
+    'analyze_and_recommend',
+    'generate_aggregated_recommendation',
+]
 
 
@@ -4,39 +4,99 @@ This agent processes multiple video analyses and recommendations to provide
 an overall actionable recommendation based on the last 10 videos.
 """
 
-import sys
-import os
+import hashlib
 import logging
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from typing import List
-from pydantic_ai import Agent
+from typing import Dict, List, Tuple
+from pydantic_ai import Agent, NativeOutput
 from pydantic_ai.exceptions import AgentRunError
-from openai import AsyncOpenAI, APIError
+from openai import APIError
+from openai_client import get_model
+from cache import cached_run
+from model_router import LARGE_MODEL
+from utils import format_holdings
 from models import Recommendation, MarketAnalysis, PortfolioContext, AggregatedRecommendation
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = AsyncOpenAI()
+# Synthesis across videos always runs on the large model
+MODEL = LARGE_MODEL
+
+SYSTEM_PROMPT = (
+    'You are a senior investment advisor expert. You analyze multiple market analyses and recommendations '
+    'from recent videos to provide a consolidated, actionable investment strategy. Your goal is to '
+    'identify patterns, trends, and consensus across multiple sources to provide the most reliable '
+    'overall recommendation. Consider risk management, diversification, and alignment with market conditions. '
+    'Based on the multiple analyses provided, give a consolidated recommendation that: '
+    '1) Identifies overall market consensus and patterns, '
+    '2) Provides a single actionable recommendation (action type), '
+    '3) Assigns a confidence level based on agreement across sources, '
+    '4) Suggests specific actions for each relevant asset, '
+    '5) Summarizes key insights and rationale, '
+    '6) Highlights any conflicting signals or areas of uncertainty. '
+    'Return your consolidated recommendation as a JSON object with fields: '
+    'action (string - overall recommended action), confidence (float 0.0-1.0), '
+    'suggested_actions (list of objects with type, symbol, rationale), summary (string - detailed rationale), '
+    'and key_insights (list of strings - main insights from the aggregated analysis).'
+)
 
 # Initialize the aggregated recommendation agent
 aggregated_agent = Agent(
-    'openai:gpt-5.2',
-    system_prompt='You are a senior investment advisor expert. You analyze multiple market analyses and recommendations '
-                  'from recent videos to provide a consolidated, actionable investment strategy. Your goal is to '
-                  'identify patterns, trends, and consensus across multiple sources to provide the most reliable '
-                  'overall recommendation. Consider risk management, diversification, and alignment with market conditions. '
-                  'Return your consolidated recommendation as a JSON object with fields: '
-                  'action (string - overall recommended action), confidence (float 0.0-1.0), '
-                  'suggested_actions (list of objects with type, symbol, rationale), summary (string - detailed rationale), '
-                  'and key_insights (list of strings - main insights from the aggregated analysis).',
-    output_type=AggregatedRecommendation,
+    get_model(MODEL),
+    system_prompt=SYSTEM_PROMPT,
+    output_type=NativeOutput(AggregatedRecommendation),
 )
 
 
+def _dedupe_videos(
+    market_analyses: List[MarketAnalysis],
+    recommendations: List[Recommendation]
+) -> List[Tuple[MarketAnalysis, Recommendation, int]]:
+    """Group identical (analysis, recommendation) pairs, keeping first-seen order.
+    
+    Returns:
+        List of (analysis, recommendation, occurrence count) tuples
+    """
+    groups: Dict[str, list] = {}
+    for analysis, rec in zip(market_analyses, recommendations):
+        key = hashlib.sha256((analysis.model_dump_json() + rec.model_dump_json()).encode('utf-8')).hexdigest()
+        if key in groups:
+            groups[key][2] += 1
+        else:
+            groups[key] = [analysis, rec, 1]
+    return [tuple(group) for group in groups.values()]
+
+
+def _video_label(index: int, count: int) -> str:
+    """Label for a video entry, noting how many identical videos it stands for."""
+    if count > 1:
+        return f'\nVideo {index} (seen in {count} videos):\n'
+    return f'\nVideo {index}:\n'
+
+
+def _format_analysis(index: int, analysis: MarketAnalysis, count: int = 1) -> str:
+    """Format one video's market analysis for the aggregated prompt."""
+    trends = ", ".join(analysis.trends) if analysis.trends else "None"
+    risk_factors = ", ".join(analysis.risk_factors) if analysis.risk_factors else "None"
+    return (
+        f'{_video_label(index, count)}'
+        f'  Conditions: {analysis.conditions}\n'
+        f'  Trends: {trends}\n'
+        f'  Risk Factors: {risk_factors}\n'
+        f'  Summary: {analysis.summary}\n'
+    )
+
+
+def _format_recommendation(index: int, rec: Recommendation, count: int = 1) -> str:
+    """Format one video's recommendation for the aggregated prompt."""
+    lines = [f'{_video_label(index, count)}  Action: {rec.action}\n  Confidence: {rec.confidence:.2f}\n']
+    if rec.suggested_actions:
+        lines.append('  Suggested Actions:\n')
+        lines.extend(f'    - {action.type.upper()} {action.symbol}: {action.rationale}\n' for action in rec.suggested_actions)
+    if rec.summary:
+        lines.append(f'  Summary: {rec.summary}\n')
+    return ''.join(lines)
+
+
 async def generate_aggregated_recommendation(
     market_analyses: List[MarketAnalysis],
     recommendations: List[Recommendation],
@@ -62,59 +122,44 @@ async def generate_aggregated_recommendation(
     if len(market_analyses) != len(recommendations):
         raise ValueError("market_analyses and recommendations must have the same length")
     
-    # Build context for aggregated recommendation
-    context_prompt = f'Based on analysis of {len(market_analyses)} recent videos, provide a consolidated investment recommendation:\n\n'
-    
-    context_prompt += 'RECENT MARKET ANALYSES:\n'
-    for i, analysis in enumerate(market_analyses, 1):
-        context_prompt += f'\nVideo {i}:\n'
-        context_prompt += f'  Conditions: {analysis.conditions}\n'
-        context_prompt += f'  Trends: {", ".join(analysis.trends) if analysis.trends else "None"}\n'
-        context_prompt += f'  Risk Factors: {", ".join(analysis.risk_factors) if analysis.risk_factors else "None"}\n'
-        context_prompt += f'  Summary: {analysis.summary}\n'
+    # Build context for aggregated recommendation. Instructions live in SYSTEM_PROMPT and the
+    # user message starts with a fixed header so the cacheable prefix stays stable.
+    parts: list[str] = [
+        'Provide a consolidated investment recommendation based on the following recent videos:\n\n',
+        'RECENT MARKET ANALYSES:\n',
+    ]
+    # Identical videos are sent once with a count instead of being repeated
+    videos = _dedupe_videos(market_analyses, recommendations)
+    parts.extend(_format_analysis(i, analysis, count) for i, (analysis, _, count) in enumerate(videos, 1))
     
-    context_prompt += '\n\nRECENT RECOMMENDATIONS:\n'
-    for i, rec in enumerate(recommendations, 1):
-        context_prompt += f'\nVideo {i}:\n'
-        context_prompt += f'  Action: {rec.action}\n'
-        context_prompt += f'  Confidence: {rec.confidence:.2f}\n'
-        if rec.suggested_actions:
-            context_prompt += '  Suggested Actions:\n'
-            for action in rec.suggested_actions:
-                context_prompt += f'    - {action.type.upper()} {action.symbol}: {action.rationale}\n'
-        if rec.summary:
-            context_prompt += f'  Summary: {rec.summary}\n'
+    parts.append('\n\nRECENT RECOMMENDATIONS:\n')
+    parts.extend(_format_recommendation(i, rec, count) for i, (_, rec, count) in enumerate(videos, 1))
     
     if portfolio_context and portfolio_context.holdings:
-        context_prompt += '\n\nCURRENT PORTFOLIO:\n'
-        context_prompt += f'Total Value: ${portfolio_context.total_value or 0:,.2f}\n'
-        context_prompt += 'Holdings:\n'
-        for holding in portfolio_context.holdings:
-            context_prompt += f'  - {holding.symbol}: {holding.quantity} (${holding.value:,.2f})\n'
-        context_prompt += '\n'
+        mentioned_text = ' '.join(
+            [analysis.summary for analysis, _, _ in videos]
+            + [action.symbol for _, rec, _ in videos for action in rec.suggested_actions]
+        )
+        parts.append('\n\nCURRENT PORTFOLIO:\n')
+        parts.append(format_holdings(portfolio_context, mentioned_text))
+        parts.append('\n')
     
-    context_prompt += '\nBased on these multiple analyses, provide a consolidated recommendation that:\n'
-    context_prompt += '1) Identifies overall market consensus and patterns\n'
-    context_prompt += '2) Provides a single actionable recommendation (action type)\n'
-    context_prompt += '3) Assigns a confidence level based on agreement across sources\n'
-    context_prompt += '4) Suggests specific actions for each relevant asset\n'
-    context_prompt += '5) Summarizes key insights and rationale\n'
-    context_prompt += '6) Highlights any conflicting signals or areas of uncertainty\n'
+    context_prompt = ''.join(parts)
     
     try:
-        result = await aggregated_agent.run(context_prompt)
+        output = await cached_run(aggregated_agent, context_prompt, model=MODEL, system_prompt=SYSTEM_PROMPT)
         
-        if not result.output:
+        if not output:
             raise AgentRunError("Agent returned empty output")
         
-        return result.output
+        return output
     except AgentRunError as e:
-        logger.error(f"Agent error during aggregated recommendation generation: {str(e)}", exc_info=True)
+        logger.error("Agent error during aggregated recommendation generation: %s", e, exc_info=True)
         raise
     except APIError as e:
-        logger.error(f"OpenAI API error during aggregated recommendation generation: {str(e)}", exc_info=True)
+        logger.error("OpenAI API error during aggregated recommendation generation: %s", e, exc_info=True)
         raise AgentRunError(f"OpenAI API error: {str(e)}") from e
     except Exception as e:
-        logger.error(f"Unexpected error during aggregated recommendation generation: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during aggregated recommendation generation: %s", e, exc_info=True)
         raise AgentRunError(f"Unexpected error: {str(e)}") from e
 
@@ -1,35 +1,57 @@
 """Market analysis agent using Pydantic AI."""
 
-import sys
-import os
 import logging
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from pydantic_ai import Agent
+from typing import AsyncIterator
+from pydantic_ai import Agent, NativeOutput
 from pydantic_ai.exceptions import AgentRunError
-from openai import AsyncOpenAI, APIError
+from openai import APIError
+from openai_client import get_model
+from cache import cached_run, cached_run_stream
+from model_router import LARGE_MODEL, select_model
+from utils import format_holdings
 from models import MarketAnalysis, PortfolioContext
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = AsyncOpenAI()
+SYSTEM_PROMPT = (
+    'You are a financial market analyst expert. Analyze video transcripts about cryptocurrency '
+    'and financial markets. Identify market conditions, trends, and risk factors. '
+    'Provide clear, structured analysis of market conditions based on the transcript content. '
+    'Provide a structured analysis including: '
+    '1) Overall market conditions (bullish, bearish, or neutral), '
+    '2) Key trends identified, '
+    '3) Risk factors mentioned, '
+    '4) A detailed summary of market conditions. '
+    'Return your analysis as a JSON object with fields: conditions (string), trends (list of strings), '
+    'risk_factors (list of strings), and summary (string).'
+)
 
 # Initialize the agent with OpenAI model
 # Fixed: Changed result_type to output_type (correct parameter name)
 analysis_agent = Agent(
-    'openai:gpt-5.2',
-    system_prompt='You are a financial market analyst expert. Analyze video transcripts about cryptocurrency '
-                  'and financial markets. Identify market conditions, trends, and risk factors. '
-                  'Provide clear, structured analysis of market conditions based on the transcript content. '
-                  'Return your analysis as a JSON object with fields: conditions (string), trends (list of strings), '
-                  'risk_factors (list of strings), and summary (string).',
-    output_type=MarketAnalysis,
+    get_model(LARGE_MODEL),
+    system_prompt=SYSTEM_PROMPT,
+    output_type=NativeOutput(MarketAnalysis),
 )
 
 
+def _build_prompt(transcript_text: str, portfolio_context: PortfolioContext = None) -> str:
+    """Build the user prompt for market analysis."""
+    # Build context for the analysis. Instructions live in SYSTEM_PROMPT and the
+    # user message starts with a fixed header so the cacheable prefix stays stable.
+    parts: list[str] = [
+        'Analyze the following video transcript for market conditions, trends, and risk factors:\n\n',
+        f'TRANSCRIPT:\n{transcript_text}\n\n',
+    ]
+    
+    if portfolio_context and portfolio_context.holdings:
+        parts.append('PORTFOLIO CONTEXT:\n')
+        parts.append(format_holdings(portfolio_context, transcript_text))
+        parts.append('\n')
+    
+    return ''.join(parts)
+
+
 async def analyze_market(transcript_text: str, portfolio_context: PortfolioContext = None) -> MarketAnalysis:
     """Analyze market conditions from transcript.
     
@@ -44,39 +66,57 @@ async def analyze_market(transcript_text: str, portfolio_context: PortfolioConte
         AgentRunError: If the AI agent fails to generate valid output
         APIError: If OpenAI API call fails
     """
-    # Build context for the analysis
-    context_prompt = 'Analyze the following video transcript for market conditions, trends, and risk factors:\n\n'
-    context_prompt += f'TRANSCRIPT:\n{transcript_text}\n\n'
-    
-    if portfolio_context and portfolio_context.holdings:
-        context_prompt += 'PORTFOLIO CONTEXT:\n'
-        context_prompt += f'Total Value: ${portfolio_context.total_value or 0:,.2f}\n'
-        context_prompt += 'Holdings:\n'
-        for holding in portfolio_context.holdings:
-            context_prompt += f'  - {holding.symbol}: {holding.quantity} (${holding.value:,.2f})\n'
-        context_prompt += '\n'
-    
-    context_prompt += 'Provide a structured analysis including: '
-    context_prompt += '1) Overall market conditions (bullish, bearish, or neutral), '
-    context_prompt += '2) Key trends identified, '
-    context_prompt += '3) Risk factors mentioned, '
-    context_prompt += '4) A detailed summary of market conditions.'
+    context_prompt = _build_prompt(transcript_text, portfolio_context)
+    model = select_model(transcript_text, len(portfolio_context.holdings) if portfolio_context else 0)
     
     try:
-        result = await analysis_agent.run(context_prompt)
+        output = await cached_run(analysis_agent, context_prompt, model=model, system_prompt=SYSTEM_PROMPT)
         
-        # Fixed: Changed from result.data to result.output (correct attribute name)
-        if not result.output:
+        if not output:
             raise AgentRunError("Agent returned empty output")
         
-        return result.output
+        return output
     except AgentRunError as e:
-        logger.error(f"Agent error during market analysis: {str(e)}", exc_info=True)
+        logger.error("Agent error during market analysis: %s", e, exc_info=True)
         raise
     except APIError as e:
-        logger.error(f"OpenAI API error during market analysis: {str(e)}", exc_info=True)
+        logger.error("OpenAI API error during market analysis: %s", e, exc_info=True)
         raise AgentRunError(f"OpenAI API error: {str(e)}") from e
     except Exception as e:
-        logger.error(f"Unexpected error during market analysis: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during market analysis: %s", e, exc_info=True)
         raise AgentRunError(f"Unexpected error: {str(e)}") from e
 
+
+async def stream_market_analysis(transcript_text: str, portfolio_context: PortfolioContext = None) -> AsyncIterator[MarketAnalysis]:
+    """Analyze market conditions from transcript, streaming partial results.
+    
+    Args:
+        transcript_text: Full transcript text from video
+        portfolio_context: Optional portfolio context for personalized analysis
+        
+    Yields:
+        Partial MarketAnalysis objects as the model generates them; the last
+        one yielded is the complete, validated analysis
+        
+    Raises:
+        AgentRunError: If the AI agent fails to generate valid output
+    """
+    context_prompt = _build_prompt(transcript_text, portfolio_context)
+    model = select_model(transcript_text, len(portfolio_context.holdings) if portfolio_context else 0)
+    
+    try:
+        output = None
+        async for output in cached_run_stream(analysis_agent, context_prompt, model=model, system_prompt=SYSTEM_PROMPT):
+            yield output
+        
+        if not output:
+            raise AgentRunError("Agent returned empty output")
+    except AgentRunError as e:
+        logger.error("Agent error during market analysis: %s", e, exc_info=True)
+        raise
+    except APIError as e:
+        logger.error("OpenAI API error during market analysis: %s", e, exc_info=True)
+        raise AgentRunError(f"OpenAI API error: {str(e)}") from e
+    except Exception as e:
+        logger.error("Unexpected error during market analysis: %s", e, exc_info=True)
+        raise AgentRunError(f"Unexpected error: {str(e)}") from e
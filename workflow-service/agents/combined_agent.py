@@ -0,0 +1,91 @@
+"""Combined market analysis and recommendation agent using Pydantic AI.
+
+This agent produces both the market analysis and the recommendation from a
+transcript in one LLM call, halving round-trips for the fast-mode workflow.
+"""
+
+import logging
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import AgentRunError
+from openai import APIError
+from openai_client import get_model
+from cache import cached_run
+from model_router import LARGE_MODEL
+from utils import format_holdings
+from models import CombinedOutput, PortfolioContext
+
+logger = logging.getLogger(__name__)
+
+# The output includes the buy/sell recommendation, so this always runs on the large model
+MODEL = LARGE_MODEL
+
+SYSTEM_PROMPT = (
+    'You are a financial market analyst and investment advisor expert. Analyze video transcripts about '
+    'cryptocurrency and financial markets, then provide actionable investment recommendations based on '
+    'that analysis and the portfolio context. '
+    'For the market analysis provide: '
+    '1) Overall market conditions (bullish, bearish, or neutral), '
+    '2) Key trends identified, '
+    '3) Risk factors mentioned, '
+    '4) A detailed summary of market conditions. '
+    'For the recommendation provide: '
+    '1) Overall action type (rebalance, hold, diversify, increase allocation, etc.), '
+    '2) Confidence level (0.0 to 1.0), '
+    '3) Specific suggested actions for each asset (type: increase/decrease/hold/add/remove, symbol, rationale), '
+    '4) A summary of the recommendation rationale. '
+    'Consider risk management, diversification, and alignment with market conditions. '
+    'Return a JSON object with fields: market_analysis (object with conditions, trends, risk_factors, summary) '
+    'and recommendation (object with action, confidence, suggested_actions, summary).'
+)
+
+# Initialize the combined agent
+combined_agent = Agent(
+    get_model(MODEL),
+    system_prompt=SYSTEM_PROMPT,
+    output_type=NativeOutput(CombinedOutput),
+)
+
+
+async def analyze_and_recommend(transcript_text: str, portfolio_context: PortfolioContext = None) -> CombinedOutput:
+    """Analyze market conditions and generate recommendations in one call.
+    
+    Args:
+        transcript_text: Full transcript text from video
+        portfolio_context: Optional portfolio context for personalized recommendations
+        
+    Returns:
+        CombinedOutput with market analysis and recommendation
+        
+    Raises:
+        AgentRunError: If the AI agent fails to generate valid output
+        APIError: If OpenAI API call fails
+    """
+    # Instructions live in SYSTEM_PROMPT; the user message starts with a fixed header
+    parts: list[str] = [
+        'Analyze the following video transcript and provide investment recommendations:\n\n',
+        f'TRANSCRIPT:\n{transcript_text}\n\n',
+    ]
+    
+    if portfolio_context and portfolio_context.holdings:
+        parts.append('CURRENT PORTFOLIO:\n')
+        parts.append(format_holdings(portfolio_context, transcript_text))
+        parts.append('\n')
+    
+    context_prompt = ''.join(parts)
+    
+    try:
+        output = await cached_run(combined_agent, context_prompt, model=MODEL, system_prompt=SYSTEM_PROMPT)
+        
+        if not output:
+            raise AgentRunError("Agent returned empty output")
+        
+        return output
+    except AgentRunError as e:
+        logger.error("Agent error during combined analysis: %s", e, exc_info=True)
+        raise
+    except APIError as e:
+        logger.error("OpenAI API error during combined analysis: %s", e, exc_info=True)
+        raise AgentRunError(f"OpenAI API error: {str(e)}") from e
+    except Exception as e:
+        logger.error("Unexpected error during combined analysis: %s", e, exc_info=True)
+        raise AgentRunError(f"Unexpected error: {str(e)}") from e
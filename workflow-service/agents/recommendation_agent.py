@@ -1,36 +1,66 @@
 """Investment recommendation agent using Pydantic AI."""
 
-import sys
-import os
 import logging
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from pydantic_ai import Agent
+from typing import AsyncIterator
+from pydantic_ai import Agent, NativeOutput
 from pydantic_ai.exceptions import AgentRunError
-from openai import AsyncOpenAI, APIError
+from openai import APIError
+from openai_client import get_model
+from cache import cached_run, cached_run_stream
+from model_router import LARGE_MODEL
+from utils import format_holdings
 from models import Recommendation, MarketAnalysis, PortfolioContext
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = AsyncOpenAI()
+# Recommendations drive the buy/sell actions, so they always run on the large model
+MODEL = LARGE_MODEL
+
+SYSTEM_PROMPT = (
+    'You are an investment advisor expert. Based on market analysis and portfolio context, '
+    'provide actionable investment recommendations. Consider risk management, diversification, '
+    'and alignment with market conditions. Provide specific, actionable recommendations '
+    'with confidence levels. Provide specific recommendations including: '
+    '1) Overall action type (rebalance, hold, diversify, increase allocation, etc.), '
+    '2) Confidence level (0.0 to 1.0), '
+    '3) Specific suggested actions for each asset (type: increase/decrease/hold/add/remove, symbol, rationale), '
+    '4) A summary of the recommendation rationale. '
+    'Return your recommendation as a JSON object with fields: '
+    'action (string), confidence (float 0.0-1.0), suggested_actions (list of objects with '
+    'type, symbol, rationale), and summary (string).'
+)
 
 # Initialize the agent with OpenAI model
 # Fixed: Changed result_type to output_type (correct parameter name)
 recommendation_agent = Agent(
-    'openai:gpt-5.2',
-    system_prompt='You are an investment advisor expert. Based on market analysis and portfolio context, '
-                  'provide actionable investment recommendations. Consider risk management, diversification, '
-                  'and alignment with market conditions. Provide specific, actionable recommendations '
-                  'with confidence levels. Return your recommendation as a JSON object with fields: '
-                  'action (string), confidence (float 0.0-1.0), suggested_actions (list of objects with '
-                  'type, symbol, rationale), and summary (string).',
-    output_type=Recommendation,
+    get_model(MODEL),
+    system_prompt=SYSTEM_PROMPT,
+    output_type=NativeOutput(Recommendation),
 )
 
 
+def _build_prompt(market_analysis: MarketAnalysis, portfolio_context: PortfolioContext = None) -> str:
+    """Build the user prompt for recommendation generation."""
+    # Build context for recommendation. Instructions live in SYSTEM_PROMPT and the
+    # user message starts with a fixed header so the cacheable prefix stays stable.
+    parts: list[str] = [
+        'Based on the following market analysis, provide investment recommendations:\n\n',
+        'MARKET ANALYSIS:\n',
+        f'Conditions: {market_analysis.conditions}\n',
+        f'Trends: {", ".join(market_analysis.trends)}\n',
+        f'Risk Factors: {", ".join(market_analysis.risk_factors)}\n',
+        f'Summary: {market_analysis.summary}\n\n',
+    ]
+    
+    if portfolio_context and portfolio_context.holdings:
+        analysis_text = ' '.join([*market_analysis.trends, *market_analysis.risk_factors, market_analysis.summary])
+        parts.append('CURRENT PORTFOLIO:\n')
+        parts.append(format_holdings(portfolio_context, analysis_text))
+        parts.append('\n')
+    
+    return ''.join(parts)
+
+
 async def generate_recommendation(
     market_analysis: MarketAnalysis,
     portfolio_context: PortfolioContext = None
@@ -48,43 +78,58 @@ async def generate_recommendation(
         AgentRunError: If the AI agent fails to generate valid output
         APIError: If OpenAI API call fails
     """
-    # Build context for recommendation
-    context_prompt = 'Based on the following market analysis, provide investment recommendations:\n\n'
-    context_prompt += 'MARKET ANALYSIS:\n'
-    context_prompt += f'Conditions: {market_analysis.conditions}\n'
-    context_prompt += f'Trends: {", ".join(market_analysis.trends)}\n'
-    context_prompt += f'Risk Factors: {", ".join(market_analysis.risk_factors)}\n'
-    context_prompt += f'Summary: {market_analysis.summary}\n\n'
-    
-    if portfolio_context and portfolio_context.holdings:
-        context_prompt += 'CURRENT PORTFOLIO:\n'
-        context_prompt += f'Total Value: ${portfolio_context.total_value or 0:,.2f}\n'
-        context_prompt += 'Holdings:\n'
-        for holding in portfolio_context.holdings:
-            context_prompt += f'  - {holding.symbol}: {holding.quantity} (${holding.value:,.2f})\n'
-        context_prompt += '\n'
-    
-    context_prompt += 'Provide specific recommendations including: '
-    context_prompt += '1) Overall action type (rebalance, hold, diversify, increase allocation, etc.), '
-    context_prompt += '2) Confidence level (0.0 to 1.0), '
-    context_prompt += '3) Specific suggested actions for each asset (type: increase/decrease/hold/add/remove, symbol, rationale), '
-    context_prompt += '4) A summary of the recommendation rationale.'
+    context_prompt = _build_prompt(market_analysis, portfolio_context)
     
     try:
-        result = await recommendation_agent.run(context_prompt)
+        output = await cached_run(recommendation_agent, context_prompt, model=MODEL, system_prompt=SYSTEM_PROMPT)
         
-        # Fixed: Changed from result.data to result.output (correct attribute name)
-        if not result.output:
+        if not output:
             raise AgentRunError("Agent returned empty output")
         
-        return result.output
+        return output
     except AgentRunError as e:
-        logger.error(f"Agent error during recommendation generation: {str(e)}", exc_info=True)
+        logger.error("Agent error during recommendation generation: %s", e, exc_info=True)
         raise
     except APIError as e:
-        logger.error(f"OpenAI API error during recommendation generation: {str(e)}", exc_info=True)
+        logger.error("OpenAI API error during recommendation generation: %s", e, exc_info=True)
         raise AgentRunError(f"OpenAI API error: {str(e)}") from e
     except Exception as e:
-        logger.error(f"Unexpected error during recommendation generation: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during recommendation generation: %s", e, exc_info=True)
         raise AgentRunError(f"Unexpected error: {str(e)}") from e
 
+
+async def stream_recommendation(
+    market_analysis: MarketAnalysis,
+    portfolio_context: PortfolioContext = None
+) -> AsyncIterator[Recommendation]:
+    """Generate investment recommendations, streaming partial results.
+    
+    Args:
+        market_analysis: Market condition analysis
+        portfolio_context: Current portfolio holdings for personalized recommendations
+        
+    Yields:
+        Partial Recommendation objects as the model generates them; the last
+        one yielded is the complete, validated recommendation
+        
+    Raises:
+        AgentRunError: If the AI agent fails to generate valid output
+    """
+    context_prompt = _build_prompt(market_analysis, portfolio_context)
+    
+    try:
+        output = None
+        async for output in cached_run_stream(recommendation_agent, context_prompt, model=MODEL, system_prompt=SYSTEM_PROMPT):
+            yield output
+        
+        if not output:
+            raise AgentRunError("Agent returned empty output")
+    except AgentRunError as e:
+        logger.error("Agent error during recommendation generation: %s", e, exc_info=True)
+        raise
+    except APIError as e:
+        logger.error("OpenAI API error during recommendation generation: %s", e, exc_info=True)
+        raise AgentRunError(f"OpenAI API error: {str(e)}") from e
+    except Exception as e:
+        logger.error("Unexpected error during recommendation generation: %s", e, exc_info=True)
+        raise AgentRunError(f"Unexpected error: {str(e)}") from e
@@ -1,13 +1,35 @@
 """Transcript extraction agent - direct tool usage."""
 
-import sys
+import asyncio
 import os
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
+from cachetools import TTLCache
 from models import Transcript
-from tools.youtube_tool import get_youtube_transcript
+from tools.youtube_tool import extract_video_id, fetch_transcript_async, get_video_metadata
+from utils import clean_transcript_text
+
+# Transcripts are immutable per video, so repeat requests are served from memory
+TRANSCRIPT_CACHE_TTL = int(os.getenv('TRANSCRIPT_CACHE_TTL', 3600))
+
+_transcript_cache: TTLCache = TTLCache(maxsize=512, ttl=TRANSCRIPT_CACHE_TTL)
+
+# In-flight fetches by video ID, so concurrent requests for an uncached video share one fetch
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _load_transcript(video_id: str) -> Transcript:
+    """Fetch, clean and cache the transcript for a video."""
+    transcript_text, duration = await fetch_transcript_async(video_id)
+    metadata = get_video_metadata(video_id)
+    
+    transcript = Transcript(
+        video_id=video_id,
+        video_title=metadata['video_title'],
+        text=clean_transcript_text(transcript_text),
+        duration=duration,
+    )
+    _transcript_cache[video_id] = transcript
+    return transcript
 
 
 async def extract_transcript(youtube_url: str) -> Transcript:
@@ -15,6 +37,10 @@ async def extract_transcript(youtube_url: str) -> Transcript:
     
     This function directly uses the YouTube tool to fetch transcripts.
     In a more complex setup, this could be wrapped in a Pydantic AI agent.
+    Caption noise such as [Music] is stripped from the text, and transcripts
+    are cached by video ID, so repeat requests for the same video skip the
+    YouTube round-trip. Concurrent requests for a video that isn't cached yet
+    wait on the same fetch.
     
     Args:
         youtube_url: YouTube video URL
@@ -22,11 +48,15 @@ async def extract_transcript(youtube_url: str) -> Transcript:
     Returns:
         Transcript model with video metadata and transcript text
     """
-    transcript_data = get_youtube_transcript(youtube_url)
+    video_id = extract_video_id(youtube_url)
+    cached = _transcript_cache.get(video_id)
+    if cached is not None:
+        return cached
     
-    return Transcript(
-        video_id=transcript_data['video_id'],
-        video_title=transcript_data['video_title'],
-        text=transcript_data['text'],
-        duration=transcript_data.get('duration'),
-    )
+    task = _inflight.get(video_id)
+    if task is None:
+        task = asyncio.create_task(_load_transcript(video_id))
+        _inflight[video_id] = task
+        task.add_done_callback(lambda _: _inflight.pop(video_id, None))
+    # Shielded so one caller disconnecting doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
@@ -0,0 +1,105 @@
+"""In-process response cache for agent runs.
+
+Agent outputs are cached by an exact hash of the model, system prompt and
+user prompt, so re-processing the same video with the same portfolio skips
+the OpenAI call entirely.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Any, AsyncIterator
+
+from cachetools import TTLCache
+from pydantic_ai import Agent
+
+from openai_client import get_model
+
+logger = logging.getLogger(__name__)
+
+# Cache settings - configurable via environment variables
+CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 86400))
+CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 1024))
+
+_response_cache: TTLCache = TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+
+
+def cache_key(model: str, system_prompt: str, prompt: str) -> str:
+    """Build the cache key for an agent call.
+
+    Args:
+        model: Model name the agent runs with
+        system_prompt: Agent system prompt
+        prompt: User prompt
+
+    Returns:
+        Hex SHA-256 digest identifying the call
+    """
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, prompt):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+async def cached_run(agent: Agent, prompt: str, *, model: str, system_prompt: str) -> Any:
+    """Run an agent, returning a cached output for identical calls.
+
+    Only non-empty outputs are cached; errors always propagate to the caller.
+
+    Args:
+        agent: Agent to run
+        prompt: User prompt
+        model: Model name to run the agent with (part of the cache key)
+        system_prompt: Agent system prompt (part of the cache key)
+
+    Returns:
+        The agent output
+    """
+    key = cache_key(model, system_prompt, prompt)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        logger.info("Response cache hit for %s", model)
+        return cached
+
+    result = await agent.run(prompt, model=get_model(model))
+    if result.output:
+        _response_cache[key] = result.output
+    return result.output
+
+
+async def cached_run_stream(agent: Agent, prompt: str, *, model: str, system_prompt: str) -> AsyncIterator[Any]:
+    """Stream an agent run, sharing the cache with cached_run.
+
+    On a cache hit the cached output is yielded once. Otherwise partial outputs
+    are yielded as the model generates them, followed by the final validated
+    output, which is cached.
+
+    Args:
+        agent: Agent to run
+        prompt: User prompt
+        model: Model name to run the agent with (part of the cache key)
+        system_prompt: Agent system prompt (part of the cache key)
+
+    Yields:
+        Partial outputs; the last one yielded is the final output
+    """
+    key = cache_key(model, system_prompt, prompt)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        logger.info("Response cache hit for %s", model)
+        yield cached
+        return
+
+    async with agent.run_stream(prompt, model=get_model(model)) as result:
+        last = None
+        async for partial in result.stream_output():
+            if partial != last:
+                yield partial
+                last = partial
+        output = await result.get_output()
+
+    if output:
+        _response_cache[key] = output
+    if output != last:
+        yield output
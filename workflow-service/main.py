@@ -1,75 +1,128 @@
 """FastAPI server for agentic workflow service."""
 
 import os
+import json
+import asyncio
 import logging
-import uuid
+import queue
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from pydantic_ai.exceptions import AgentRunError
 
-from models import WorkflowRequest, WorkflowResponse, AggregatedRecommendationRequest, AggregatedRecommendation
-from agents import extract_transcript, analyze_market, generate_recommendation, generate_aggregated_recommendation
-from tools.youtube_tool import extract_video_id, fetch_transcript
+from openai_client import create_client, use_client
+from rate_limit import TokenBucket, sweep_buckets
+from models import (
+    WorkflowRequest, WorkflowResponse, WorkflowBatchRequest, WorkflowBatchItem, WorkflowBatchResponse,
+    AggregatedRecommendationRequest, AggregatedRecommendation,
+)
+from agents import (
+    extract_transcript, analyze_market, stream_market_analysis,
+    generate_recommendation, stream_recommendation, analyze_and_recommend,
+    generate_aggregated_recommendation,
+)
+from tools.youtube_tool import extract_video_id
+from utils import load_encoding, truncate_to_tokens
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
 
+# YouTube errors that mean the video's transcript can't be used (reported as 400s)
+_YOUTUBE_ERRORS = (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable)
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging with structured format
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 
+# Request ID of the request being handled, propagated through async tasks
+request_id_var: ContextVar[str] = ContextVar("request_id", default="system")
+
+# Stamp every log record with the current request ID when it is created
+_default_record_factory = logging.getLogRecordFactory()
+
+def _request_id_record_factory(*args, **kwargs):
+    record = _default_record_factory(*args, **kwargs)
+    record.request_id = request_id_var.get()
+    return record
+
+logging.setLogRecordFactory(_request_id_record_factory)
+
 # Custom formatter that handles request_id
 class RequestIDFormatter(logging.Formatter):
     """Custom formatter that includes request_id in log records."""
     def format(self, record):
-        # Add request_id if not present (for logs outside request context)
+        # Records are stamped by the record factory; fall back for any created elsewhere
         if not hasattr(record, 'request_id'):
             record.request_id = 'system'
         return super().format(record)
 
 # Set up logging
+# Records are handed to a queue and written to stderr by a listener thread, so
+# log calls on the request path never block the event loop on the write
 handler = logging.StreamHandler()
 handler.setFormatter(RequestIDFormatter('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'))
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, handler)
+queue_handler = QueueHandler(log_queue)
+# Only merge args (and any traceback) into the message; the listener's handler applies the real format
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+# force=True: when started as a script, uvicorn imports this file a second time as
+# "main" (and spawned workers import it as "__mp_main__" too). The last import is the
+# one whose lifespan starts log_listener, so its queue handler must replace any earlier one.
 logging.basicConfig(
     level=getattr(logging, log_level, logging.INFO),
-    handlers=[handler]
+    handlers=[queue_handler],
+    force=True,
 )
 logger = logging.getLogger(__name__)
 
 # Request ID middleware
 class RequestIDMiddleware:
-    """Middleware to add request ID for tracing."""
-    async def __call__(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
+    """ASGI middleware to add request ID for tracing.
+    
+    Implemented as plain ASGI rather than an @app.middleware("http") function,
+    which avoids BaseHTTPMiddleware's extra task and body streaming per request.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = os.urandom(4).hex()
+        # Exposed to handlers as request.state.request_id
+        scope.setdefault("state", {})["request_id"] = request_id
         
-        # Update logger context for this request
-        old_factory = logging.getLogRecordFactory()
-        def record_factory(*args, **kwargs):
-            record = old_factory(*args, **kwargs)
-            record.request_id = request_id
-            return record
-        logging.setLogRecordFactory(record_factory)
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
         
+        # Tag logs for this request; the context var is scoped to this request's tasks
+        token = request_id_var.set(request_id)
         try:
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
+            await self.app(scope, receive, send_with_request_id)
         finally:
-            # Restore original factory
-            logging.setLogRecordFactory(old_factory)
+            request_id_var.reset(token)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Rate limits per client address, one bucket per endpoint
+health_rate_limit = TokenBucket(10)  # 10 requests per minute
+process_rate_limit = TokenBucket(5)  # 5 requests per minute
+# Charged per video: 5 videos per minute like /process, with room for one full batch
+batch_rate_limit = TokenBucket(10, period=120.0)
+stream_rate_limit = TokenBucket(5)
+aggregate_rate_limit = TokenBucket(5)
+RATE_LIMITS = (health_rate_limit, process_rate_limit, batch_rate_limit, stream_rate_limit, aggregate_rate_limit)
 
 # Validate OpenAI API key at startup
 def validate_openai_key():
@@ -78,15 +131,10 @@ def validate_openai_key():
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is not set")
     
-    # Test API connectivity
-    try:
-        client = AsyncOpenAI()
-        # We'll do a simple validation - just check if key format is valid
-        # Full connectivity check will be done in health endpoint
-        if not api_key.startswith('sk-'):
-            logger.warning("OpenAI API key format may be invalid (should start with 'sk-')")
-    except Exception as e:
-        logger.warning(f"Could not validate OpenAI client: {e}")
+    # We'll do a simple validation - just check if key format is valid
+    # Full connectivity check will be done in health endpoint
+    if not api_key.startswith('sk-'):
+        logger.warning("OpenAI API key format may be invalid (should start with 'sk-')")
     
     logger.info("OpenAI API key validated")
 
@@ -95,70 +143,55 @@ def validate_openai_key():
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown."""
     # Startup
-    logger.info("Starting workflow service...")
+    log_listener.start()
     try:
-        validate_openai_key()
-        logger.info("Workflow service started successfully")
-    except ValueError as e:
-        logger.error(f"Startup validation failed: {e}")
-        raise
-    yield
-    # Shutdown
-    logger.info("Shutting down workflow service...")
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="0xNetworth Workflow Service",
-    description="Agentic workflow service for YouTube video market analysis",
-    version="1.0.0",
-    lifespan=lifespan,
-    # Limit request body size to 10MB
-    max_request_size=10 * 1024 * 1024,
-)
-
-# Add rate limiter to app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# CORS middleware - configurable via environment variable
-cors_origins = os.getenv('CORS_ORIGINS', '*').split(',')
-# In production, default to empty list if not set (more secure)
-if os.getenv('ENVIRONMENT') == 'production' and cors_origins == ['*']:
-    logger.warning("CORS_ORIGINS is set to '*' in production. Consider restricting to specific domains.")
-    cors_origins = []  # Default to no CORS in production if not explicitly set
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=cors_origins if cors_origins != ['*'] else ["*"],
-    allow_credentials=True,
-    allow_methods=["GET", "POST"],
-    allow_headers=["*"],
-    max_age=3600,
-)
+        logger.info("Starting workflow service...")
+        try:
+            validate_openai_key()
+            logger.info("Workflow service started successfully")
+        except ValueError as e:
+            logger.error("Startup validation failed: %s", e)
+            raise
+        # One client (and connection pool) for the app's lifetime, shared with the agents
+        app.state.openai_client = create_client()
+        use_client(app.state.openai_client)
+        app.state.openai_configured = bool(os.getenv('OPENAI_API_KEY'))
+        # Evict idle clients from the rate limit buckets
+        sweep_task = asyncio.create_task(sweep_buckets(RATE_LIMITS))
+        # Load the tokenizer off the event loop; transcripts are truncated by length until it is ready
+        encoding_task = asyncio.create_task(load_encoding())
+        yield
+        # Shutdown
+        logger.info("Shutting down workflow service...")
+        sweep_task.cancel()
+        encoding_task.cancel()
+        await app.state.openai_client.close()
+    finally:
+        # Flush queued records before the process exits
+        log_listener.stop()
 
-# Add request ID middleware
-app.middleware("http")(RequestIDMiddleware())
+# Routes are collected on a router and mounted by create_app()
+router = APIRouter()
 
 # Custom exception handlers
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle Pydantic validation errors."""
     request_id = getattr(request.state, 'request_id', 'unknown')
-    logger.warning(f"Validation error: {exc.errors()}")
+    errors = exc.errors()
+    logger.warning("Validation error: %s", errors)
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "detail": "Validation error",
-            "errors": exc.errors(),
+            "errors": errors,
             "request_id": request_id
         }
     )
 
-@app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     """Handle ValueError exceptions (e.g., invalid YouTube URL)."""
     request_id = getattr(request.state, 'request_id', 'unknown')
-    logger.error(f"Value error: {str(exc)}")
+    logger.error("Value error: %s", exc)
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={
@@ -167,13 +200,11 @@ async def value_error_handler(request: Request, exc: ValueError):
         }
     )
 
-# Register handlers for each YouTube exception type separately
-# FastAPI doesn't support tuples in exception_handler decorator
 async def youtube_error_handler(request: Request, exc: Exception):
     """Handle YouTube API errors."""
     request_id = getattr(request.state, 'request_id', 'unknown')
     error_type = type(exc).__name__
-    logger.error(f"YouTube API error ({error_type}): {str(exc)}")
+    logger.error("YouTube API error (%s): %s", error_type, exc)
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={
@@ -183,16 +214,10 @@ async def youtube_error_handler(request: Request, exc: Exception):
         }
     )
 
-# Register the same handler for each YouTube exception type
-app.add_exception_handler(TranscriptsDisabled, youtube_error_handler)
-app.add_exception_handler(NoTranscriptFound, youtube_error_handler)
-app.add_exception_handler(VideoUnavailable, youtube_error_handler)
-
-@app.exception_handler(AgentRunError)
 async def agent_error_handler(request: Request, exc: AgentRunError):
     """Handle Pydantic AI agent errors."""
     request_id = getattr(request.state, 'request_id', 'unknown')
-    logger.error(f"Agent error: {str(exc)}", exc_info=True)
+    logger.error("Agent error: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -203,8 +228,7 @@ async def agent_error_handler(request: Request, exc: AgentRunError):
     )
 
 
-@app.get("/health")
-@limiter.limit("10/minute")
+@router.get("/health", dependencies=[Depends(health_rate_limit)])
 async def health_check(request: Request):
     """Health check endpoint with OpenAI API connectivity check."""
     request_id = getattr(request.state, 'request_id', 'unknown')
@@ -216,36 +240,28 @@ async def health_check(request: Request):
     }
     
     # Check OpenAI API connectivity
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
+    if not request.app.state.openai_configured:
         health_status["status"] = "unhealthy"
         health_status["error"] = "OPENAI_API_KEY not set"
         return JSONResponse(status_code=503, content=health_status)
     
-    try:
-        client = AsyncOpenAI()
-        # Simple connectivity test - just verify client can be created
-        # Full API test would require an actual API call (costs money)
+    # Simple connectivity test - just verify the shared client is open
+    # Full API test would require an actual API call (costs money)
+    if not request.app.state.openai_client.is_closed():
         health_status["openai"] = "configured"
-    except Exception as e:
+    else:
         health_status["status"] = "degraded"
-        health_status["openai"] = f"error: {str(e)}"
+        health_status["openai"] = "error: OpenAI client is not available"
     
     return health_status
 
 
-@app.post("/process", response_model=WorkflowResponse)
-@limiter.limit("5/minute")  # Rate limit: 5 requests per minute per IP
-async def process_video(request: Request, workflow_request: WorkflowRequest) -> WorkflowResponse:
-    """Process YouTube video through the agentic workflow.
+async def _run_workflow(workflow_request: WorkflowRequest) -> WorkflowResponse:
+    """Run the three-stage workflow for a single video.
     
-    This endpoint orchestrates the three-stage workflow:
-    1. Extract transcript from YouTube video
-    2. Analyze market conditions from transcript
-    3. Generate investment recommendations
+    Shared by the /process and /process_batch endpoints.
     
     Args:
-        request: FastAPI request object (for rate limiting)
         workflow_request: WorkflowRequest with YouTube URL and optional portfolio context
         
     Returns:
@@ -254,106 +270,118 @@ async def process_video(request: Request, workflow_request: WorkflowRequest) ->
     Raises:
         HTTPException: If any step of the workflow fails
     """
-    request_id = getattr(request.state, 'request_id', 'unknown')
-    logger.info(f"[{request_id}] Processing video: {workflow_request.youtube_url}")
+    url_str = str(workflow_request.youtube_url)
+    logger.info("Processing video: %s", url_str)
     
     try:
-        # Pre-flight validation: Check if video ID can be extracted and transcript is available
-        logger.info(f"[{request_id}] Pre-flight validation: Extracting video ID...")
+        # Pre-flight validation: Check if video ID can be extracted
+        logger.info("Pre-flight validation: Extracting video ID...")
         try:
-            video_id = extract_video_id(str(workflow_request.youtube_url))
-            logger.info(f"[{request_id}] Video ID extracted: {video_id}")
+            video_id = extract_video_id(url_str)
+            logger.info("Video ID extracted: %s", video_id)
         except ValueError as e:
-            logger.error(f"[{request_id}] Invalid YouTube URL: {str(e)}")
+            logger.error("Invalid YouTube URL: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid YouTube URL: {str(e)}"
             )
         
-        # Pre-flight check: Verify transcript is available
-        logger.info(f"[{request_id}] Pre-flight validation: Checking transcript availability...")
-        try:
-            # Just check if transcript exists, don't fetch it yet
-            from youtube_transcript_api import YouTubeTranscriptApi
-            yt_api = YouTubeTranscriptApi()
-            transcript_list = yt_api.list(video_id)
-            # Try to find a transcript (this will raise if none available)
-            try:
-                transcript_list.find_transcript(['en'])
-            except NoTranscriptFound:
-                transcript_list.find_generated_transcript(['en'])
-            logger.info(f"[{request_id}] Transcript available")
-        except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable) as e:
-            error_type = type(e).__name__
-            logger.error(f"[{request_id}] Transcript not available: {error_type} - {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Transcript not available for video {video_id}: {str(e)}"
-            )
-        
         # Stage 1: Extract transcript
-        logger.info(f"[{request_id}] Stage 1: Extracting transcript...")
+        logger.info("Stage 1: Extracting transcript...")
         try:
-            transcript = await extract_transcript(str(workflow_request.youtube_url))
-            logger.info(f"[{request_id}] Transcript extracted: {transcript.video_id} ({len(transcript.text)} chars)")
-        except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable) as e:
+            transcript = await extract_transcript(url_str)
+            logger.info("Transcript extracted: %s (%d chars)", transcript.video_id, len(transcript.text))
+        except _YOUTUBE_ERRORS as e:
             error_type = type(e).__name__
-            logger.error(f"[{request_id}] Transcript extraction failed: {error_type} - {str(e)}")
+            logger.error("Transcript extraction failed: %s - %s", error_type, e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to extract transcript: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"[{request_id}] Unexpected error during transcript extraction: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during transcript extraction: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error during transcript extraction: {str(e)}"
             )
         
+        # Bound the transcript sent to the LLM; the response still carries the full text
+        text_for_llm = truncate_to_tokens(transcript.text)
+        
+        # Fast mode: Stages 2 and 3 in a single LLM call
+        if workflow_request.fast_mode:
+            logger.info("Stages 2-3: Analyzing market and generating recommendations...")
+            try:
+                combined = await analyze_and_recommend(
+                    transcript_text=text_for_llm,
+                    portfolio_context=workflow_request.portfolio_context
+                )
+                logger.info("Combined analysis complete: %s, %s (confidence: %s)", combined.market_analysis.conditions,
+                            combined.recommendation.action, combined.recommendation.confidence)
+            except AgentRunError as e:
+                logger.error("Agent error during combined analysis: %s", e, exc_info=True)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"AI agent error during combined analysis: {str(e)}"
+                )
+            except Exception as e:
+                logger.error("Unexpected error during combined analysis: %s", e, exc_info=True)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Unexpected error during combined analysis: {str(e)}"
+                )
+            
+            logger.info("Workflow completed successfully")
+            return WorkflowResponse(
+                transcript=transcript,
+                market_analysis=combined.market_analysis,
+                recommendation=combined.recommendation
+            )
+        
         # Stage 2: Analyze market conditions
-        logger.info(f"[{request_id}] Stage 2: Analyzing market conditions...")
+        logger.info("Stage 2: Analyzing market conditions...")
         try:
             market_analysis = await analyze_market(
-                transcript_text=transcript.text,
+                transcript_text=text_for_llm,
                 portfolio_context=workflow_request.portfolio_context
             )
-            logger.info(f"[{request_id}] Market analysis complete: {market_analysis.conditions}")
+            logger.info("Market analysis complete: %s", market_analysis.conditions)
         except AgentRunError as e:
-            logger.error(f"[{request_id}] Agent error during market analysis: {str(e)}", exc_info=True)
+            logger.error("Agent error during market analysis: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"AI agent error during market analysis: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"[{request_id}] Unexpected error during market analysis: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during market analysis: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error during market analysis: {str(e)}"
             )
         
         # Stage 3: Generate recommendations
-        logger.info(f"[{request_id}] Stage 3: Generating recommendations...")
+        logger.info("Stage 3: Generating recommendations...")
         try:
             recommendation = await generate_recommendation(
                 market_analysis=market_analysis,
                 portfolio_context=workflow_request.portfolio_context
             )
-            logger.info(f"[{request_id}] Recommendation generated: {recommendation.action} (confidence: {recommendation.confidence})")
+            logger.info("Recommendation generated: %s (confidence: %s)", recommendation.action, recommendation.confidence)
         except AgentRunError as e:
-            logger.error(f"[{request_id}] Agent error during recommendation generation: {str(e)}", exc_info=True)
+            logger.error("Agent error during recommendation generation: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"AI agent error during recommendation generation: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"[{request_id}] Unexpected error during recommendation generation: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during recommendation generation: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error during recommendation generation: {str(e)}"
             )
         
         # Return combined response
-        logger.info(f"[{request_id}] Workflow completed successfully")
+        logger.info("Workflow completed successfully")
         return WorkflowResponse(
             transcript=transcript,
             market_analysis=market_analysis,
@@ -365,15 +393,172 @@ async def process_video(request: Request, workflow_request: WorkflowRequest) ->
         raise
     except Exception as e:
         # Catch-all for any other unexpected errors
-        logger.error(f"[{request_id}] Unexpected error processing video: {str(e)}", exc_info=True)
+        logger.error("Unexpected error processing video: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process video: {str(e)}"
         )
 
 
-@app.post("/aggregate", response_model=AggregatedRecommendation)
-@limiter.limit("5/minute")  # Rate limit: 5 requests per minute per IP
+@router.post("/process", response_model=WorkflowResponse, dependencies=[Depends(process_rate_limit)])
+async def process_video(request: Request, workflow_request: WorkflowRequest) -> WorkflowResponse:
+    """Process YouTube video through the agentic workflow.
+    
+    This endpoint orchestrates the three-stage workflow:
+    1. Extract transcript from YouTube video
+    2. Analyze market conditions from transcript
+    3. Generate investment recommendations
+    
+    Args:
+        request: FastAPI request object
+        workflow_request: WorkflowRequest with YouTube URL and optional portfolio context
+        
+    Returns:
+        WorkflowResponse with transcript, market analysis, and recommendations
+        
+    Raises:
+        HTTPException: If any step of the workflow fails
+    """
+    return await _run_workflow(workflow_request)
+
+
+@router.post("/process_batch", response_model=WorkflowBatchResponse)
+async def process_video_batch(request: Request, batch_request: WorkflowBatchRequest) -> WorkflowBatchResponse:
+    """Process several YouTube videos in one call.
+    
+    Videos are processed concurrently, so the batch takes roughly as long as
+    its slowest video instead of the sum of all of them. A failing video does
+    not fail the batch; its error is reported in the matching result entry.
+    
+    Args:
+        request: FastAPI request object
+        batch_request: WorkflowBatchRequest with the videos to process
+        
+    Returns:
+        WorkflowBatchResponse with one result per requested video, in request order
+        
+    Raises:
+        HTTPException: 429 if the client has exceeded the per-video rate limit
+    """
+    batch_rate_limit.enforce(request, cost=len(batch_request.requests))
+    logger.info("Processing batch of %d videos", len(batch_request.requests))
+    
+    outcomes = await asyncio.gather(
+        *(_run_workflow(item) for item in batch_request.requests),
+        return_exceptions=True,
+    )
+    
+    results = []
+    for item, outcome in zip(batch_request.requests, outcomes):
+        url_str = str(item.youtube_url)
+        if isinstance(outcome, HTTPException):
+            results.append(WorkflowBatchItem(
+                youtube_url=url_str,
+                status_code=outcome.status_code,
+                error=outcome.detail,
+            ))
+        elif isinstance(outcome, BaseException):
+            logger.error("Unexpected error in batch item: %s", outcome, exc_info=outcome)
+            results.append(WorkflowBatchItem(
+                youtube_url=url_str,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                error=f"Failed to process video: {str(outcome)}",
+            ))
+        else:
+            results.append(WorkflowBatchItem(youtube_url=url_str, response=outcome))
+    
+    return WorkflowBatchResponse(results=results)
+
+
+def _sse_event(payload: dict) -> str:
+    """Format a payload as a Server-Sent Events data frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def _workflow_events(workflow_request: WorkflowRequest, request_id: str):
+    """Run the workflow, yielding SSE frames as each stage progresses.
+    
+    Events have a "stage" of transcript, analysis, recommendation, complete or
+    error. Analysis and recommendation events carry the partial output generated
+    so far in "delta"; transcript and complete events carry the full data.
+    """
+    try:
+        transcript = await extract_transcript(str(workflow_request.youtube_url))
+        logger.info("Transcript extracted: %s (%d chars)", transcript.video_id, len(transcript.text))
+        yield _sse_event({"stage": "transcript", "data": transcript.model_dump(mode="json")})
+        text_for_llm = truncate_to_tokens(transcript.text)
+        
+        market_analysis = None
+        async for market_analysis in stream_market_analysis(
+            transcript_text=text_for_llm,
+            portfolio_context=workflow_request.portfolio_context
+        ):
+            yield _sse_event({"stage": "analysis", "delta": market_analysis.model_dump(mode="json")})
+        
+        recommendation = None
+        async for recommendation in stream_recommendation(
+            market_analysis=market_analysis,
+            portfolio_context=workflow_request.portfolio_context
+        ):
+            yield _sse_event({"stage": "recommendation", "delta": recommendation.model_dump(mode="json")})
+        
+        response = WorkflowResponse(
+            transcript=transcript,
+            market_analysis=market_analysis,
+            recommendation=recommendation
+        )
+        logger.info("Streaming workflow completed successfully")
+        yield _sse_event({"stage": "complete", "data": response.model_dump(mode="json")})
+    except Exception as e:
+        # Headers are already sent, so errors are reported in-band
+        logger.error("Error during streaming workflow: %s", e, exc_info=True)
+        yield _sse_event({
+            "stage": "error",
+            "detail": str(e),
+            "error_type": type(e).__name__,
+            "request_id": request_id
+        })
+
+
+@router.post("/process/stream", dependencies=[Depends(stream_rate_limit)])
+async def process_video_stream(request: Request, workflow_request: WorkflowRequest) -> StreamingResponse:
+    """Process YouTube video through the agentic workflow, streaming progress.
+    
+    Runs the same three stages as /process but responds with Server-Sent Events,
+    so clients can render the analysis and recommendation while they are being
+    generated. The final "complete" event carries the same payload as /process.
+    
+    Args:
+        request: FastAPI request object
+        workflow_request: WorkflowRequest with YouTube URL and optional portfolio context
+        
+    Returns:
+        StreamingResponse emitting text/event-stream frames
+        
+    Raises:
+        HTTPException: If the YouTube URL is invalid
+    """
+    request_id = getattr(request.state, 'request_id', 'unknown')
+    logger.info("Streaming video: %s", workflow_request.youtube_url)
+    
+    # Validate the URL before the stream starts so it can still be reported as a 400
+    try:
+        extract_video_id(str(workflow_request.youtube_url))
+    except ValueError as e:
+        logger.error("Invalid YouTube URL: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid YouTube URL: {str(e)}"
+        )
+    
+    return StreamingResponse(
+        _workflow_events(workflow_request, request_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.post("/aggregate", response_model=AggregatedRecommendation, dependencies=[Depends(aggregate_rate_limit)])
 async def aggregate_recommendations(request: Request, aggregated_request: AggregatedRecommendationRequest) -> AggregatedRecommendation:
     """Generate consolidated investment recommendation from multiple video analyses.
     
@@ -381,7 +566,7 @@ async def aggregate_recommendations(request: Request, aggregated_request: Aggreg
     to provide an overall actionable recommendation based on consensus and patterns.
     
     Args:
-        request: FastAPI request object (for rate limiting)
+        request: FastAPI request object
         aggregated_request: AggregatedRecommendationRequest with market analyses and recommendations
         
     Returns:
@@ -390,8 +575,7 @@ async def aggregate_recommendations(request: Request, aggregated_request: Aggreg
     Raises:
         HTTPException: If the aggregation fails
     """
-    request_id = getattr(request.state, 'request_id', 'unknown')
-    logger.info(f"[{request_id}] Generating aggregated recommendation from {len(aggregated_request.market_analyses)} analyses")
+    logger.info("Generating aggregated recommendation from %d analyses", len(aggregated_request.market_analyses))
     
     try:
         # Validate input
@@ -408,22 +592,22 @@ async def aggregate_recommendations(request: Request, aggregated_request: Aggreg
             )
         
         # Generate aggregated recommendation
-        logger.info(f"[{request_id}] Processing {len(aggregated_request.market_analyses)} video analyses...")
+        logger.info("Processing %d video analyses...", len(aggregated_request.market_analyses))
         try:
             aggregated_rec = await generate_aggregated_recommendation(
                 market_analyses=aggregated_request.market_analyses,
                 recommendations=aggregated_request.recommendations,
                 portfolio_context=aggregated_request.portfolio_context
             )
-            logger.info(f"[{request_id}] Aggregated recommendation generated: {aggregated_rec.action} (confidence: {aggregated_rec.confidence})")
+            logger.info("Aggregated recommendation generated: %s (confidence: %s)", aggregated_rec.action, aggregated_rec.confidence)
         except AgentRunError as e:
-            logger.error(f"[{request_id}] Agent error during aggregated recommendation generation: {str(e)}", exc_info=True)
+            logger.error("Agent error during aggregated recommendation generation: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"AI agent error during aggregated recommendation generation: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"[{request_id}] Unexpected error during aggregated recommendation generation: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during aggregated recommendation generation: %s", e, exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Unexpected error during aggregated recommendation generation: {str(e)}"
@@ -436,15 +620,85 @@ async def aggregate_recommendations(request: Request, aggregated_request: Aggreg
         raise
     except Exception as e:
         # Catch-all for any other unexpected errors
-        logger.error(f"[{request_id}] Unexpected error processing aggregated recommendation: {str(e)}", exc_info=True)
+        logger.error("Unexpected error processing aggregated recommendation: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process aggregated recommendation: {str(e)}"
         )
 
 
+def _cors_origins_from_env() -> list[str]:
+    """Read the allowed CORS origins from the environment."""
+    # CORS origins - configurable via environment variable
+    cors_origins = os.getenv('CORS_ORIGINS', '*').split(',')
+    # In production, default to empty list if not set (more secure)
+    if os.getenv('ENVIRONMENT') == 'production' and cors_origins == ['*']:
+        logger.warning("CORS_ORIGINS is set to '*' in production. Consider restricting to specific domains.")
+        cors_origins = []  # Default to no CORS in production if not explicitly set
+    return cors_origins
+
+
+def create_app(cors_origins: Optional[list[str]] = None) -> FastAPI:
+    """Create the workflow service application.
+    
+    Args:
+        cors_origins: Allowed CORS origins; read from CORS_ORIGINS and ENVIRONMENT when omitted
+        
+    Returns:
+        Configured FastAPI application
+    """
+    if cors_origins is None:
+        cors_origins = _cors_origins_from_env()
+    
+    # Keep the default response class: endpoints with a response_model are then
+    # serialized straight to JSON bytes by pydantic-core. Setting a custom
+    # default_response_class (e.g. ORJSONResponse) disables that fast path.
+    app = FastAPI(
+        title="0xNetworth Workflow Service",
+        description="Agentic workflow service for YouTube video market analysis",
+        version="1.0.0",
+        lifespan=lifespan,
+        # Limit request body size to 10MB
+        max_request_size=10 * 1024 * 1024,
+    )
+    
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["*"],
+        max_age=3600,
+    )
+    
+    # Add request ID middleware
+    app.add_middleware(RequestIDMiddleware)
+    
+    # Custom exception handlers
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    # FastAPI doesn't support tuples in exception handler registration
+    for exc_class in _YOUTUBE_ERRORS:
+        app.add_exception_handler(exc_class, youtube_error_handler)
+    app.add_exception_handler(AgentRunError, agent_error_handler)
+    
+    app.include_router(router)
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
     
     port = int(os.getenv('PORT', 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvloop and httptools ship with uvicorn[standard]; an import string is required for workers > 1
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv('WORKERS', 1)),
+    )
@@ -0,0 +1,35 @@
+"""Model selection for agent calls.
+
+Short transcripts with small portfolios are well within a small model's
+capability, so they are routed to the cheaper, faster model. Everything
+else runs on the large model, as do the stages that produce buy/sell
+recommendations: the recommendation step, the fused fast-mode analysis and
+recommendation step, and the aggregated synthesis step.
+"""
+
+SMALL_MODEL = 'openai:gpt-4o-mini'
+LARGE_MODEL = 'openai:gpt-5.2'
+
+# Inputs up to these limits are routed to SMALL_MODEL
+SMALL_MODEL_MAX_TOKENS = 3000
+SMALL_MODEL_MAX_HOLDINGS = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (~4 characters per token)."""
+    return len(text) // 4
+
+
+def select_model(text: str, holdings_count: int = 0) -> str:
+    """Pick the model for an agent call.
+    
+    Args:
+        text: Main variable input of the prompt (transcript, analysis summary, etc.)
+        holdings_count: Number of holdings in the portfolio context
+        
+    Returns:
+        Model name to run the agent with
+    """
+    if estimate_tokens(text) <= SMALL_MODEL_MAX_TOKENS and holdings_count <= SMALL_MODEL_MAX_HOLDINGS:
+        return SMALL_MODEL
+    return LARGE_MODEL
@@ -21,6 +21,7 @@ class WorkflowRequest(BaseModel):
     """Request model for workflow execution."""
     youtube_url: HttpUrl = Field(..., description="YouTube video URL to process")
     portfolio_context: Optional[PortfolioContext] = Field(None, description="Current portfolio context for analysis")
+    fast_mode: bool = Field(False, description="Generate market analysis and recommendation in a single LLM call")
 
 
 class Transcript(BaseModel):
@@ -54,6 +55,12 @@ class Recommendation(BaseModel):
     summary: Optional[str] = Field(None, description="Recommendation summary")
 
 
+class CombinedOutput(BaseModel):
+    """Market analysis and recommendation generated in a single LLM call."""
+    market_analysis: MarketAnalysis = Field(..., description="Market condition analysis")
+    recommendation: Recommendation = Field(..., description="Investment recommendations")
+
+
 class AggregatedRecommendation(BaseModel):
     """Aggregated recommendation from multiple video analyses."""
     action: str = Field(..., description="Overall consolidated recommended action")
@@ -77,3 +84,19 @@ class WorkflowResponse(BaseModel):
     recommendation: Recommendation = Field(..., description="Investment recommendations")
 
 
+class WorkflowBatchRequest(BaseModel):
+    """Request model for processing several videos in one call."""
+    requests: List[WorkflowRequest] = Field(..., min_length=1, max_length=10, description="Videos to process (1 to 10)")
+
+
+class WorkflowBatchItem(BaseModel):
+    """Result for a single video in a batch."""
+    youtube_url: str = Field(..., description="YouTube video URL that was processed")
+    status_code: int = Field(200, description="HTTP-style status code for this video")
+    response: Optional[WorkflowResponse] = Field(None, description="Workflow result, if processing succeeded")
+    error: Optional[str] = Field(None, description="Error detail, if processing failed")
+
+
+class WorkflowBatchResponse(BaseModel):
+    """Response model for batch workflow execution."""
+    results: List[WorkflowBatchItem] = Field(..., description="One result per requested video, in request order")
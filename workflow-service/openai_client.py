@@ -0,0 +1,53 @@
+"""Shared OpenAI client for all agents.
+
+Every agent call goes through one AsyncOpenAI client, so they share a single
+connection pool instead of each module opening its own. The client uses the
+SDK's aiohttp transport, which holds up much better than the default httpx
+transport under many concurrent requests.
+
+The app lifespan creates the client, installs it with use_client() and closes
+it on shutdown. Until then (e.g. when the agents are used outside the app) a
+default client created at import is used.
+"""
+
+from functools import lru_cache
+
+from openai import AsyncOpenAI, DefaultAioHttpClient
+from pydantic_ai.models import Model
+from pydantic_ai.models.openai import OpenAIResponsesModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+
+def create_client() -> AsyncOpenAI:
+    """Create an OpenAI client on the aiohttp transport."""
+    return AsyncOpenAI(http_client=DefaultAioHttpClient())
+
+
+_provider = OpenAIProvider(openai_client=create_client())
+
+
+def use_client(client: AsyncOpenAI) -> None:
+    """Send all subsequent agent calls through client.
+
+    Args:
+        client: Client to use; the caller owns it and is responsible for closing it
+    """
+    global _provider
+    _provider = OpenAIProvider(openai_client=client)
+    # Models built for the previous client must not be handed out again
+    get_model.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_model(model_name: str) -> Model:
+    """Get the pydantic-ai model for a model name, backed by the current client.
+
+    Args:
+        model_name: Model name such as 'openai:gpt-5.2'
+
+    Returns:
+        Model instance that sends requests through the client installed with use_client
+    """
+    # All routed models are OpenAI models; drop the "openai:" provider prefix
+    _, _, name = model_name.rpartition(':')
+    return OpenAIResponsesModel(name, provider=_provider)
@@ -0,0 +1,88 @@
+"""In-memory rate limiting keyed by client address.
+
+Each endpoint gets its own TokenBucket, used as a FastAPI dependency. Bucket
+state is a plain dict that is only touched from the event loop, so no locking
+is needed.
+"""
+
+import asyncio
+import time
+from typing import Iterable
+
+from fastapi import HTTPException, Request, status
+
+
+class TokenBucket:
+    """Token bucket allowing `limit` requests per `period` seconds per client.
+
+    A client starts with `limit` tokens, spends one per request and regains
+    them continuously at limit/period tokens per second.
+    """
+
+    __slots__ = ('rate', 'burst', 'buckets')
+
+    def __init__(self, limit: int, period: float = 60.0):
+        self.rate = limit / period
+        self.burst = float(limit)
+        # key -> (tokens left, time of last update)
+        self.buckets: dict[str, tuple[float, float]] = {}
+
+    def check(self, key: str, cost: int = 1) -> bool:
+        """Spend cost tokens for key.
+
+        Args:
+            key: Client key (remote address)
+            cost: Tokens the request consumes
+
+        Returns:
+            True if the request is allowed, False if the client doesn't have enough tokens
+        """
+        now = time.monotonic()
+        tokens, last = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        allowed = tokens >= cost
+        self.buckets[key] = (tokens - cost if allowed else tokens, now)
+        return allowed
+
+    def sweep(self) -> None:
+        """Drop clients whose buckets have refilled completely."""
+        now = time.monotonic()
+        refill_time = self.burst / self.rate
+        stale = [key for key, (_, last) in self.buckets.items() if now - last >= refill_time]
+        for key in stale:
+            del self.buckets[key]
+
+    def enforce(self, request: Request, cost: int = 1) -> None:
+        """Charge the calling client cost tokens.
+
+        Args:
+            request: Incoming request, keyed by its remote address
+            cost: Tokens the request consumes
+
+        Raises:
+            HTTPException: 429 if the client has exceeded the limit
+        """
+        key = request.client.host if request.client else '127.0.0.1'
+        if not self.check(key, cost):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {self.burst:g} per {self.burst / self.rate:g} seconds"
+            )
+
+    async def __call__(self, request: Request) -> None:
+        """FastAPI dependency charging one token per request."""
+        self.enforce(request)
+
+
+async def sweep_buckets(buckets: Iterable[TokenBucket], interval: float = 60.0) -> None:
+    """Periodically evict idle clients from the given buckets.
+
+    Args:
+        buckets: Buckets to sweep
+        interval: Seconds between sweeps
+    """
+    buckets = list(buckets)
+    while True:
+        await asyncio.sleep(interval)
+        for bucket in buckets:
+            bucket.sweep()
@@ -1,25 +1,29 @@
 """YouTube transcript extraction tool."""
 
 import re
+import asyncio
+from functools import lru_cache
 from typing import Optional
 from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+from youtube_transcript_api._errors import NoTranscriptFound
 
 
+# Compiled once at import: watch (v= anywhere in the query), embed, and youtu.be URLs
+_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/)|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_BARE_ID_RE = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+
+
+@lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> str:
     """Extract video ID from YouTube URL."""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, str(url))
+    # Only YouTube URLs can match the URL pattern; skip the search for anything else
+    if 'youtu' in url:
+        match = _VIDEO_ID_RE.search(url)
         if match:
             return match.group(1)
     
     # If no pattern matches, assume the input is already a video ID
-    if len(url) == 11 and url.replace('-', '').replace('_', '').isalnum():
+    if len(url) == 11 and _BARE_ID_RE.match(url):
         return url
     
     raise ValueError(f"Invalid YouTube URL or video ID: {url}")
@@ -53,44 +57,50 @@ def fetch_transcript(video_id: str) -> tuple[str, Optional[int]]:
         NoTranscriptFound: If no transcript is available
         VideoUnavailable: If video is unavailable
     """
+    # Create instance of YouTubeTranscriptApi (it's an instance method, not class method)
+    # Fixed: Changed from YouTubeTranscriptApi.list_transcripts() to YouTubeTranscriptApi().list()
+    yt_api = YouTubeTranscriptApi()
+    
+    # Try to get transcript (prefer English, but fallback to any available)
+    transcript_list = yt_api.list(video_id)
+    
+    # Try to get English transcript first
     try:
-        # Create instance of YouTubeTranscriptApi (it's an instance method, not class method)
-        # Fixed: Changed from YouTubeTranscriptApi.list_transcripts() to YouTubeTranscriptApi().list()
-        yt_api = YouTubeTranscriptApi()
-        
-        # Try to get transcript (prefer English, but fallback to any available)
-        transcript_list = yt_api.list(video_id)
-        
-        # Try to get English transcript first
-        try:
-            transcript = transcript_list.find_transcript(['en'])
-        except NoTranscriptFound:
-            # Fallback to any available transcript
-            transcript = transcript_list.find_generated_transcript(['en'])
-        
-        # Fetch the actual transcript data
-        transcript_data = transcript.fetch()
-        
-        # Combine all text segments
-        # Fixed: FetchedTranscriptSnippet objects use attributes, not dictionary keys
-        # Changed from item['text'] to item.text
-        full_text = ' '.join([item.text for item in transcript_data])
-        
-        # Calculate duration (last item's start + duration)
-        # Fixed: Changed from last_item['start'] to last_item.start
-        duration = None
-        if transcript_data:
-            last_item = transcript_data[-1]
-            duration = int(last_item.start + last_item.duration)
-        
-        return full_text, duration
-        
-    except TranscriptsDisabled:
-        raise TranscriptsDisabled(f"Transcripts are disabled for video {video_id}")
+        transcript = transcript_list.find_transcript(['en'])
     except NoTranscriptFound:
-        raise NoTranscriptFound(f"No transcript found for video {video_id}")
-    except VideoUnavailable:
-        raise VideoUnavailable(f"Video {video_id} is unavailable")
+        # Fallback to any available transcript
+        transcript = transcript_list.find_generated_transcript(['en'])
+    
+    # Fetch the actual transcript data
+    transcript_data = transcript.fetch()
+    
+    # Combine all text segments
+    # Fixed: FetchedTranscriptSnippet objects use attributes, not dictionary keys
+    # Changed from item['text'] to item.text
+    full_text = ' '.join([item.text for item in transcript_data])
+    
+    # Calculate duration (last item's start + duration)
+    # Fixed: Changed from last_item['start'] to last_item.start
+    duration = None
+    if transcript_data:
+        last_item = transcript_data[-1]
+        duration = int(last_item.start + last_item.duration)
+    
+    return full_text, duration
+
+
+async def fetch_transcript_async(video_id: str) -> tuple[str, Optional[int]]:
+    """Fetch transcript for a YouTube video without blocking the event loop.
+    
+    youtube_transcript_api uses blocking HTTP, so the fetch runs in a worker thread.
+    
+    Args:
+        video_id: YouTube video ID
+        
+    Returns:
+        Tuple of (transcript_text, duration_in_seconds)
+    """
+    return await asyncio.to_thread(fetch_transcript, video_id)
 
 
 def get_youtube_transcript(url: str) -> dict:
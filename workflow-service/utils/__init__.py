@@ -0,0 +1,7 @@
+"""Utilities package."""
+
+from .portfolio import select_relevant_holdings, format_holdings
+from .transcript import clean_transcript_text
+from .tokens import load_encoding, truncate_to_tokens
+
+__all__ = ['select_relevant_holdings', 'format_holdings', 'clean_transcript_text', 'load_encoding', 'truncate_to_tokens']
@@ -0,0 +1,54 @@
+"""Portfolio helpers for prompt construction."""
+
+import re
+from typing import List
+
+from models import Holding, PortfolioContext
+
+# Default number of holdings included in agent prompts
+MAX_PROMPT_HOLDINGS = 20
+
+# Ticker-like words; inner '.' and '-' are kept so symbols such as BRK.B and BTC-USD match
+_TOKEN_RE = re.compile(r'[A-Za-z0-9](?:[A-Za-z0-9.-]*[A-Za-z0-9])?')
+
+
+def select_relevant_holdings(holdings: List[Holding], context_text: str, k: int = MAX_PROMPT_HOLDINGS) -> List[Holding]:
+    """Select the holdings worth including in a prompt.
+    
+    Holdings whose symbol appears in the context text (matched case-sensitively)
+    come first, then the remaining holdings by value. At most k holdings are
+    returned, sorted by symbol so the same portfolio always renders identically.
+    
+    Args:
+        holdings: Portfolio holdings
+        context_text: Text the prompt is about (transcript, analysis, etc.)
+        k: Maximum number of holdings to return
+        
+    Returns:
+        Selected holdings sorted by symbol
+    """
+    if len(holdings) > k:
+        # Case-sensitive, so tickers that are also common words ("IT", "ON") only count when written as tickers
+        mentioned = set(_TOKEN_RE.findall(context_text))
+        ranked = sorted(holdings, key=lambda h: (h.symbol not in mentioned, -h.value))
+        holdings = ranked[:k]
+    return sorted(holdings, key=lambda h: h.symbol)
+
+
+def format_holdings(portfolio_context: PortfolioContext, context_text: str) -> str:
+    """Render the portfolio total and relevant holdings for a prompt.
+    
+    Args:
+        portfolio_context: Portfolio context with holdings
+        context_text: Text the prompt is about, used to pick relevant holdings
+        
+    Returns:
+        Prompt lines with the total value and selected holdings
+    """
+    holdings = select_relevant_holdings(portfolio_context.holdings, context_text)
+    parts = [f'Total Value: ${portfolio_context.total_value or 0:,.2f}\n', 'Holdings:\n']
+    parts.extend(f'  - {holding.symbol}: {holding.quantity} (${holding.value:,.2f})\n' for holding in holdings)
+    omitted = len(portfolio_context.holdings) - len(holdings)
+    if omitted:
+        parts.append(f'  ... and {omitted} other holdings\n')
+    return ''.join(parts)
@@ -0,0 +1,64 @@
+"""Token budgeting for text sent to the LLM."""
+
+import asyncio
+import logging
+from typing import Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Tokenizer used by the gpt-4o and gpt-5 model families
+ENCODING_NAME = 'o200k_base'
+
+# Transcript tokens passed to the analysis stage
+MAX_TRANSCRIPT_TOKENS = 6000
+
+# Characters per token assumed when bounding the text to encode (about twice the average)
+_MAX_CHARS_PER_TOKEN = 8
+
+# Set by load_encoding(); None until the tokenizer has been loaded
+_encoding: Optional[tiktoken.Encoding] = None
+
+
+async def load_encoding(retry_interval: float = 60.0) -> None:
+    """Load the tokenizer, retrying until it succeeds.
+    
+    tiktoken downloads the BPE file on first use unless it is in
+    TIKTOKEN_CACHE_DIR, so the load runs in a worker thread. Run this as a
+    background task at startup; until it completes, truncate_to_tokens
+    estimates tokens from length.
+    
+    Args:
+        retry_interval: Seconds to wait between failed attempts
+    """
+    global _encoding
+    while _encoding is None:
+        try:
+            _encoding = await asyncio.to_thread(tiktoken.get_encoding, ENCODING_NAME)
+        except Exception as e:
+            logger.warning("Could not load %s tokenizer, retrying in %gs: %s", ENCODING_NAME, retry_interval, e)
+            await asyncio.sleep(retry_interval)
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_TRANSCRIPT_TOKENS) -> str:
+    """Truncate text to at most max_tokens tokens.
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        
+    Returns:
+        The text unchanged if it fits the budget, otherwise its leading max_tokens tokens
+    """
+    if _encoding is None:
+        # Tokenizer not loaded yet; same ~4 characters per token estimate as model_router.estimate_tokens
+        return text[:max_tokens * 4]
+
+    # Only the leading tokens matter, so encode a bounded prefix rather than the whole
+    # transcript (tokens average ~4 characters, so this prefix holds well over max_tokens)
+    prefix = text[:max_tokens * _MAX_CHARS_PER_TOKEN]
+    tokens = _encoding.encode(prefix, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return prefix
+    return _encoding.decode(tokens[:max_tokens])
@@ -0,0 +1,27 @@
+"""Transcript text helpers."""
+
+import re
+
+# Non-speech cues inserted by YouTube auto-captions
+_CAPTION_CUE_RE = re.compile(r'\[(?:music|applause|laughter|cheering|silence|inaudible|noise)\]|♪', re.IGNORECASE)
+# Immediately repeated words ("the the the")
+_REPEATED_WORD_RE = re.compile(r'\b(\w+)(?:\s+\1\b)+', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def clean_transcript_text(text: str) -> str:
+    """Remove caption noise from transcript text.
+    
+    Strips non-speech cues such as [Music] and [Applause], collapses
+    immediately repeated words, and normalizes whitespace. This shrinks the
+    transcript sent to the LLM without changing what was said.
+    
+    Args:
+        text: Raw transcript text
+        
+    Returns:
+        Cleaned transcript text
+    """
+    text = _CAPTION_CUE_RE.sub(' ', text)
+    text = _REPEATED_WORD_RE.sub(r'\1', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()